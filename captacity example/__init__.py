@@ -16,6 +16,8 @@ from .text_drawer import (
 shadow_cache = {}
 lines_cache = {}
 
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "fonts")
+
 def fits_frame(line_count, font, font_size, stroke_width, frame_width):
     def fit_function(text):
         lines = calculate_lines(
@@ -102,13 +104,12 @@ def create_shadow(text: str, font_size: int, font: str, blur_radius: float, opac
     return shadow
 
 def get_font_path(font):
-    if os.path.exists(font):
+    if os.path.isfile(font):
         return font
 
-    dirname = os.path.dirname(__file__)
-    font = os.path.join(dirname, "assets", "fonts", font)
+    font = os.path.join(FONTS_DIR, font)
 
-    if not os.path.exists(font):
+    if not os.path.isfile(font):
         raise FileNotFoundError(f"Font '{font}' not found")
 
     return font
@@ -1,13 +1,22 @@
-import openai
-from openai._types import FileTypes
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from openai._types import FileTypes
+
+logger = logging.getLogger(__name__)
 
 def transcribe_with_api(
-    audio_file: FileTypes,
+    audio_file: "FileTypes",
     prompt: str | None = None
 ):
     """
     Transcribe an audio file using the OpenAI Whisper API
     """
+    import openai
+
     transcript = openai.audio.transcriptions.create(
         model="whisper-1",
         file=open(audio_file, "rb"),
@@ -29,22 +38,83 @@ def transcribe_with_api(
         "words": transcript.words,
     }]
 
+@lru_cache(maxsize=None)
+def load_local_model(name: str = "base"):
+    """
+    Load a local Whisper model once and reuse it for every
+    transcription in this process
+    """
+    import whisper
+
+    return whisper.load_model(name)
+
+@lru_cache(maxsize=None)
+def load_faster_whisper_model(name: str = "base"):
+    """
+    Load a faster-whisper (CTranslate2) model, quantized to int8
+    (int8_float16 on GPU)
+    """
+    import ctranslate2
+    from faster_whisper import WhisperModel
+
+    if ctranslate2.get_cuda_device_count() > 0:
+        return WhisperModel(name, device="cuda", compute_type="int8_float16")
+    return WhisperModel(name, device="cpu", compute_type="int8")
+
+def transcribe_with_faster_whisper(
+    audio_file: "str | np.ndarray",
+    prompt: str | None = None
+):
+    """
+    Transcribe an audio file using faster-whisper
+    (https://pypi.org/project/faster-whisper/)
+
+    Accepts a path or 16 kHz mono float32 samples
+    """
+    model = load_faster_whisper_model("base")
+
+    segments, _ = model.transcribe(
+        audio_file,
+        word_timestamps=True,
+        initial_prompt=prompt,
+    )
+
+    # Return segments in the same format as local Whisper
+    return [{
+        "start": segment.start,
+        "end": segment.end,
+        "text": segment.text,
+        "words": [
+            {"word": word.word, "start": word.start, "end": word.end}
+            for word in segment.words
+        ],
+    } for segment in segments]
+
 def transcribe_locally(
-    audio_file: str,
+    audio_file: "str | np.ndarray",
     prompt: str | None = None
 ):
     """
     Transcribe an audio file using the local Whisper package
-    (https://pypi.org/project/openai-whisper/)
+    (https://pypi.org/project/openai-whisper/), preferring
+    faster-whisper when it is installed
+
+    Accepts a path or 16 kHz mono float32 samples
     """
-    import whisper
+    try:
+        return transcribe_with_faster_whisper(audio_file, prompt)
+    except ImportError:
+        pass
+    except (RuntimeError, OSError) as e:
+        # Installed but unusable (missing CUDA/cuDNN libraries, model download failure)
+        logger.warning(f"faster-whisper failed, falling back to Whisper: {e}")
 
-    model = whisper.load_model("base")
+    model = load_local_model("base")
 
     transcription = model.transcribe(
         audio=audio_file,
         word_timestamps=True,
-        fp16=False,
+        fp16=model.device.type == "cuda",
         initial_prompt=prompt,
     )
 
@@ -11,11 +11,24 @@ from .utils import (
     extract_game_name_from_url,
     setup_logging
 )
-from .assets import AssetManager
-from .video import VideoProcessor
-from .captions import CaptionManager
-from .tts import TTSProcessor
-from .catalog import CatalogManager
+
+# The processing managers pull in PIL, numpy and MoviePy; import them on first
+# use so callers that only need config/utils (e.g. the GUI) start quickly
+_LAZY_MODULES = {
+    "AssetManager": ".assets",
+    "VideoProcessor": ".video",
+    "CaptionManager": ".captions",
+    "TTSProcessor": ".tts",
+    "CatalogManager": ".catalog",
+}
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_MODULES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __version__ = "1.0.0"
 __all__ = [
@@ -2,10 +2,13 @@
 Asset management for downloading and processing game assets
 """
 
+import os
 import logging
 import json
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -16,12 +19,28 @@ from .utils import (
     create_safe_name, 
     extract_steam_app_id, 
     download_file,
+    HTTP_SESSION,
+    detect_media_type,
     is_valid_image_file,
     is_valid_video_file
 )
 
 logger = logging.getLogger(__name__)
 
+# Successful appdetails responses keyed by app ID, as (fetched_at, data)
+_app_details_cache = {}
+
+@lru_cache(maxsize=8)
+def _get_placeholder_font(font_size: int) -> ImageFont.ImageFont:
+    """Load the placeholder font once per size; every placeholder shares the face"""
+    font_path = config.get_directory("fonts") / "Roboto-Bold.ttf"
+    try:
+        if font_path.exists():
+            return ImageFont.truetype(str(font_path), font_size)
+        return ImageFont.truetype("arial.ttf", font_size)
+    except OSError:
+        return ImageFont.load_default()
+
 class AssetManager:
     """Manages downloading and organizing game assets"""
     
@@ -90,12 +109,8 @@ class AssetManager:
                 logger.error("Could not extract Steam App ID from URL")
                 return metadata
             
-            # Get data from Steam API
-            api_url = f"https://store.steampowered.com/api/appdetails?appids={app_id}"
-            headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-            
-            response = requests.get(api_url, headers=headers, timeout=30)
-            data = response.json()
+            # Get data from Steam API (or a recent cached response)
+            data = self._get_app_details(app_id)
             
             if not data or not data.get(app_id, {}).get('success', False):
                 logger.warning("Steam API request failed")
@@ -119,21 +134,42 @@ class AssetManager:
             screenshots = app_data.get('screenshots', [])
             max_images = config.get("assets.max_images", 15)
             
+            pending = []
             for i, screenshot in enumerate(screenshots[:max_images]):
                 img_url = screenshot.get('path_full')
                 if img_url:
                     img_path = images_dir / f"screenshot_{i+1:02d}.jpg"
-                    if download_file(img_url, img_path):
+                    # Screenshots are immutable on Steam's CDN; keep ones from earlier runs
+                    if is_valid_image_file(img_path):
                         metadata["images_downloaded"] += 1
-                    time.sleep(0.5)  # Rate limiting
+                    else:
+                        pending.append((img_url, img_path))
             
-            # Download trailer if available
+            # Trailer, unless an earlier run already fetched it
+            trailer = None
             movies = app_data.get('movies', [])
             if movies:
                 movie_url = movies[0].get('mp4', {}).get('max')
                 if movie_url:
                     video_path = videos_dir / f"{create_safe_name(metadata.get('name', 'game'))}_trailer.mp4"
-                    if download_file(movie_url, video_path):
+                    if is_valid_video_file(video_path) and video_path.stat().st_size > 0:
+                        metadata["videos_downloaded"] += 1
+                    else:
+                        trailer = (movie_url, video_path)
+            
+            # Fetch the rest concurrently; each download is network-bound. The
+            # trailer is the longest transfer, so it starts first alongside the screenshots
+            if pending or trailer:
+                # 0 or less in the config means no parallelism, i.e. one worker
+                workers = max(1, min(config.get("assets.download_workers", 5), len(pending) + bool(trailer)))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    trailer_future = executor.submit(download_file, *trailer, show_progress=False) if trailer else None
+                    results = executor.map(
+                        lambda item: download_file(item[0], item[1], show_progress=False),
+                        pending
+                    )
+                    metadata["images_downloaded"] += sum(results)
+                    if trailer_future and trailer_future.result():
                         metadata["videos_downloaded"] += 1
             
             logger.info(f"[DOWNLOADED] {metadata['images_downloaded']} images from Steam")
@@ -143,6 +179,55 @@ class AssetManager:
         
         return metadata
     
+    def _get_app_details(self, app_id: str) -> Optional[Dict]:
+        """Get raw appdetails JSON, reusing a cached response younger than the TTL"""
+        cache_file = self.temp_dir / "steam_cache" / f"appdetails_{app_id}.json"
+        ttl = config.get("assets.steam_cache_hours", 24) * 3600
+        
+        # Same game again in this process: skip even the file read
+        memo = _app_details_cache.get(app_id)
+        if memo and time.time() - memo[0] < ttl:
+            return memo[1]
+        
+        cached = None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            fetched_at = cache_file.stat().st_mtime
+            if time.time() - fetched_at < ttl:
+                logger.info(f"[CACHE] Using cached Steam data for app {app_id}")
+                _app_details_cache[app_id] = (fetched_at, cached)
+                return cached
+        except (OSError, json.JSONDecodeError):
+            pass
+        
+        try:
+            api_url = f"https://store.steampowered.com/api/appdetails?appids={app_id}"
+            
+            # Shared session: keep-alive connection and User-Agent set once
+            response = HTTP_SESSION.get(api_url, timeout=30)
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            if cached:
+                logger.warning(f"[CACHE] Steam API request failed ({e}), using stale cached data")
+                return cached
+            raise
+        
+        # Store the raw response so the cache survives changes to the extraction code
+        if data and data.get(app_id, {}).get('success', False):
+            _app_details_cache[app_id] = (time.time(), data)
+            try:
+                # Write then rename so a crash never leaves a truncated cache file
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = cache_file.with_name(cache_file.name + ".tmp")
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(temp_file, cache_file)
+            except OSError as e:
+                logger.warning(f"Failed to cache Steam data: {e}")
+        
+        return data
+    
     def _create_placeholder_assets(self, game_name: str, images_dir: Path, count: int = 5) -> int:
         """Create placeholder images when real assets aren't available"""
         try:
@@ -154,46 +239,21 @@ class AssetManager:
                 (147, 112, 219),  # Medium purple
             ]
             
-            for i in range(count):
-                img = Image.new('RGB', (1920, 1080), colors[i % len(colors)])
-                draw = ImageDraw.Draw(img)
-                
-                # Try to use custom font
-                try:
-                    font_path = config.get_directory("fonts") / "Roboto-Bold.ttf"
-                    if font_path.exists():
-                        font = ImageFont.truetype(str(font_path), 120)
-                    else:
-                        font = ImageFont.truetype("arial.ttf", 120)
-                except:
-                    font = ImageFont.load_default()
-                
-                # Add text
-                text = f"{game_name}\nPlaceholder Image {i+1}"
-                
-                # Calculate text position (center)
-                bbox = draw.textbbox((0, 0), text, font=font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-                x = (1920 - text_width) // 2
-                y = (1080 - text_height) // 2
-                
-                # Draw text with outline
-                outline_color = (0, 0, 0)
-                text_color = (255, 255, 255)
-                
-                # Draw outline
-                for dx in [-2, -1, 0, 1, 2]:
-                    for dy in [-2, -1, 0, 1, 2]:
-                        if dx != 0 or dy != 0:
-                            draw.text((x + dx, y + dy), text, font=font, fill=outline_color)
-                
-                # Draw main text
-                draw.text((x, y), text, font=font, fill=text_color)
-                
-                # Save image
-                img_path = images_dir / f"placeholder_{i+1:02d}.jpg"
-                img.save(img_path, 'JPEG', quality=90)
+            # Custom font if available, loaded once for every placeholder
+            font = _get_placeholder_font(120)
+            
+            # Each image is independent. Text drawing holds the GIL, but the JPEG
+            # encode (the bulk of the work at 1920x1080) releases it, so threads overlap
+            def render(i):
+                self._create_placeholder_image(game_name, images_dir, i, colors[i % len(colors)], font)
+            
+            workers = min(count, os.cpu_count() or 1)
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(render, range(count)))
+            else:
+                for i in range(count):
+                    render(i)
             
             logger.info(f"[CREATED] {count} placeholder images for {game_name}")
             return count
@@ -202,6 +262,35 @@ class AssetManager:
             logger.error(f"[ERROR] Placeholder creation failed: {e}")
             return 0
     
+    def _create_placeholder_image(self, game_name: str, images_dir: Path, index: int,
+                                  color: Tuple[int, int, int], font: ImageFont.ImageFont):
+        """Render and save one placeholder image"""
+        img = Image.new('RGB', (1920, 1080), color)
+        draw = ImageDraw.Draw(img)
+        
+        # Add text
+        text = f"{game_name}\nPlaceholder Image {index+1}"
+        
+        # Calculate text position (center)
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        x = (1920 - text_width) // 2
+        y = (1080 - text_height) // 2
+        
+        # Draw text with outline
+        outline_color = (0, 0, 0)
+        text_color = (255, 255, 255)
+        
+        # Draw main text with a native 2px stroke (one rasterization pass)
+        draw.text((x, y), text, font=font, fill=text_color,
+                  stroke_width=2, stroke_fill=outline_color)
+        
+        # Save image (flat colour and text: 4:2:0 at quality 75 is visually identical
+        # to quality 90 and encodes faster)
+        img_path = images_dir / f"placeholder_{index+1:02d}.jpg"
+        img.save(img_path, 'JPEG', quality=75, subsampling=2)
+    
     def _save_metadata(self, assets_dir: Path, metadata: Dict):
         """Save asset metadata to JSON file"""
         try:
@@ -229,15 +318,23 @@ class AssetManager:
         if not images_dir.exists():
             return []
         
-        # Get all valid image files
-        image_files = []
-        for pattern in config.get("assets.image_formats", ["jpg", "jpeg", "png"]):
-            for img_file in images_dir.glob(f'*.{pattern}'):
-                if is_valid_image_file(img_file, config.get("assets.min_file_size", 30000)):
-                    image_files.append(str(img_file))
+        # Get all valid image files in a single directory pass (DirEntry caches stat)
+        extensions = {f".{ext.lower()}" for ext in config.get("assets.image_formats", ["jpg", "jpeg", "png"])}
+        min_size = config.get("assets.min_file_size", 30000)
+        
+        sized_files = []
+        with os.scandir(images_dir) as entries:
+            for entry in entries:
+                if not entry.is_file() or os.path.splitext(entry.name)[1].lower() not in extensions:
+                    continue
+                size = entry.stat().st_size
+                # Magic-byte probe rejects error pages saved under an image name
+                if size >= min_size and detect_media_type(entry.path) == "image":
+                    sized_files.append((size, entry.path))
         
         # Sort by file size (bigger = better quality)
-        image_files.sort(key=lambda x: Path(x).stat().st_size, reverse=True)
+        sized_files.sort(key=lambda item: item[0], reverse=True)
+        image_files = [path for _, path in sized_files]
         
         # Limit count if specified
         if max_count:
@@ -252,11 +349,13 @@ class AssetManager:
         if not videos_dir.exists():
             return []
         
-        video_files = []
-        for pattern in config.get("assets.video_formats", ["mp4", "avi", "mov"]):
-            for video_file in videos_dir.glob(f'*.{pattern}'):
-                if is_valid_video_file(video_file):
-                    video_files.append(str(video_file))
+        extensions = {f".{ext.lower()}" for ext in config.get("assets.video_formats", ["mp4", "avi", "mov"])}
+        
+        with os.scandir(videos_dir) as entries:
+            video_files = [
+                entry.path for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions
+            ]
         
         logger.info(f"[VIDEOS] Found {len(video_files)} valid videos")
         return video_files
\ No newline at end of file
@@ -2,34 +2,145 @@
 Caption generation and management for videos
 """
 
+import os
+import re
 import logging
 import tempfile
+import textwrap
 import subprocess
 import numpy as np
 import sys
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
 from .config import config
-from .utils import create_safe_name, cleanup_files
+from .utils import create_safe_name, cleanup_files, get_encoder_settings
 
 logger = logging.getLogger(__name__)
 
-# Try to import captacity modules for transcription
-try:
-    captacity_dir = Path("captacity example")
-    sys.path.insert(0, str(captacity_dir))
-    import segment_parser
-    import transcriber
-    CAPTACITY_AVAILABLE = True
-    logger.info("[CAPTACITY] Modules loaded successfully")
-except ImportError:
-    logger.warning("[CAPTACITY] Modules not found, will use fallback caption method")
-    segment_parser = None
-    transcriber = None
-    CAPTACITY_AVAILABLE = False
+# Sentence boundary used to split scripts into caption segments
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Captacity modules for transcription, imported on first use by _load_captacity()
+segment_parser = None
+transcriber = None
+CAPTACITY_AVAILABLE = False
+_CAPTACITY_LOADED = False
+
+def _load_captacity() -> bool:
+    """Import captacity modules once; later calls return the cached result"""
+    global segment_parser, transcriber, CAPTACITY_AVAILABLE, _CAPTACITY_LOADED
+    if _CAPTACITY_LOADED:
+        return CAPTACITY_AVAILABLE
+    _CAPTACITY_LOADED = True
+    
+    try:
+        captacity_dir = config.project_root / "captacity example"
+        if str(captacity_dir) not in sys.path:
+            sys.path.insert(0, str(captacity_dir))
+        import segment_parser
+        import transcriber
+        CAPTACITY_AVAILABLE = True
+        logger.info("[CAPTACITY] Modules loaded successfully")
+    except ImportError:
+        logger.warning("[CAPTACITY] Modules not found, will use fallback caption method")
+        segment_parser = None
+        transcriber = None
+        CAPTACITY_AVAILABLE = False
+    
+    return CAPTACITY_AVAILABLE
+
+@lru_cache(maxsize=8)
+def _get_caption_font(font_size: int) -> ImageFont.ImageFont:
+    """Load the caption font once per size; every word frame shares the face"""
+    try:
+        return ImageFont.truetype("arial.ttf", font_size)
+    except OSError:
+        try:
+            return ImageFont.truetype("C:/Windows/Fonts/arial.ttf", font_size)
+        except OSError:
+            return ImageFont.load_default()
+
+# Scratch surface for text measurement (textbbox only needs the font)
+_MEASURE_DRAW = ImageDraw.Draw(Image.new('L', (1, 1)))
+
+@lru_cache(maxsize=4096)
+def _text_bbox(text: str, font: ImageFont.ImageFont) -> Tuple[int, int, int, int]:
+    """Measure text at the origin; words recur across frames and captions"""
+    return _MEASURE_DRAW.textbbox((0, 0), text, font=font)
+
+@lru_cache(maxsize=4096)
+def _text_length(text: str, font: ImageFont.ImageFont) -> int:
+    """Advance width of text; cheaper than a bbox when only the width is needed"""
+    return round(font.getlength(text))
+
+@lru_cache(maxsize=1024)
+def _outlined_word_masks(word: str, font: ImageFont.ImageFont,
+                         outline_width: int = 3) -> Tuple[int, int, Image.Image, Image.Image]:
+    """
+    Rasterize a word's glyph and outline masks once; every word is drawn at least
+    twice (white base, yellow highlight) and common words recur across captions.
+    Returns (dx, dy, glyph_mask, outline_mask), the masks' offset from the text origin
+    """
+    # Rasterize the glyphs once into a mask with room for the outline
+    left, top, right, bottom = _text_bbox(word, font)
+    mask = Image.new('L', (right - left + 2 * outline_width, bottom - top + 2 * outline_width), 0)
+    ImageDraw.Draw(mask).text((outline_width - left, outline_width - top), word, font=font, fill=255)
+    
+    # Dilating the mask gives the same outline as drawing the word at every
+    # offset within outline_width (the old 2px shadow sat entirely under it)
+    outline = mask.filter(ImageFilter.MaxFilter(2 * outline_width + 1))
+    
+    return left - outline_width, top - outline_width, mask, outline
+
+@lru_cache(maxsize=256)
+def _layout_caption(text: str, width: int, height: int,
+                    font_size: int) -> Tuple[int, int, Tuple[Tuple[str, int, int], ...]]:
+    """
+    Lay out a caption once: returns (tile_y, tile_height, word_positions) where
+    word_positions holds (word, x, y) in tile coordinates, in caption order
+    """
+    font = _get_caption_font(font_size)
+    
+    # Calculate text layout with line breaks (improved version)
+    max_chars_per_line = 25  # Reduced from 30 for better readability
+    lines = textwrap.wrap(text, width=max_chars_per_line,
+                          break_long_words=False, break_on_hyphens=False)
+    
+    # Limit to 1 line max (improved captacity style)
+    lines = lines[:1]
+    
+    # Calculate vertical positioning (improved positioning)
+    # Video layout: 60% images at top, 40% video at bottom
+    image_section_height = int(height * 0.6)  # Top 60% is for images
+    line_height = font_size + 15
+    total_height = len(lines) * line_height
+    padding_from_bottom = 40  # Small padding from bottom of image section
+    start_y = image_section_height - total_height - padding_from_bottom  # Bottom of image section
+    
+    # Tile covers the text plus room for the outline
+    tile_margin = 20
+    tile_y = max(0, start_y - tile_margin)
+    start_y -= tile_y
+    
+    word_positions = []
+    for i, line in enumerate(lines):
+        y_pos = start_y + i * line_height
+        
+        # Calculate starting x position for centering
+        line_width = _text_length(line, font)
+        word_x = (width - line_width) // 2
+        
+        for word in line.split():
+            word_positions.append((word, word_x, y_pos))
+            
+            # Calculate next word position
+            word_x += _text_length(word + " ", font)
+    
+    return tile_y, total_height + 2 * tile_margin, tuple(word_positions)
 
 class CaptionManager:
     """Manages caption creation and styling"""
@@ -58,7 +169,9 @@ class CaptionManager:
         ]
         
         for path in common_paths:
-            if Path(path).exists():
+            if Path(path).is_file():
+                # Absolute, since the ASS burn-in runs FFmpeg from a temp directory
+                path = os.path.abspath(path)
                 logger.info(f"[FFMPEG] Found FFmpeg at: {path}")
                 return path
         
@@ -78,43 +191,41 @@ class CaptionManager:
             True if successful, False otherwise
         """
         try:
-            from moviepy.editor import VideoFileClip, ImageClip, CompositeVideoClip
+            from moviepy.editor import VideoFileClip, CompositeVideoClip
             
             logger.info("[CAPTIONS] Adding beautiful captions with word highlighting...")
-            
-            # Extract audio for transcription
-            temp_audio_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False).name
-            
-            if self.ffmpeg_path:
-                # Use FFmpeg if available
-                try:
-                    subprocess.run([
-                        self.ffmpeg_path, '-y', '-i', input_video, temp_audio_file
-                    ], capture_output=True, check=True)
-                    logger.info("[AUDIO] Extracted audio using FFmpeg")
-                except subprocess.CalledProcessError as e:
-                    logger.warning(f"[AUDIO] FFmpeg extraction failed: {e}")
-                    # Fall back to MoviePy
-                    if not self._extract_audio_with_moviepy(input_video, temp_audio_file):
-                        return False
-            else:
-                # Use MoviePy as fallback
-                if not self._extract_audio_with_moviepy(input_video, temp_audio_file):
+            _load_captacity()
+            
+            # Decode audio straight into memory for local transcription; a WAV
+            # file is only written when FFmpeg piping isn't possible
+            audio_samples = self._read_audio_samples(input_video) if self.ffmpeg_path else None
+            temp_audio_file = None
+            if audio_samples is None:
+                temp_audio_file = self._extract_audio_file(input_video)
+                if not temp_audio_file:
                     return False
             
-            # Load video to get dimensions and duration
-            video = VideoFileClip(input_video)
-            width, height = video.size
-            duration = video.duration
+            # Read dimensions and duration from the container header; a decoding
+            # reader is only opened if the MoviePy renderer is actually used
+            from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+            video_info = ffmpeg_parse_infos(input_video)
+            width, height = video_info["video_size"]
+            duration = video_info["duration"]
             
             # Try transcription or create manual segments
             segments = None
             try:
                 if CAPTACITY_AVAILABLE and transcriber and segment_parser:
                     logger.info("[TRANSCRIPTION] Attempting transcription...")
-                    segments = transcriber.transcribe_locally(temp_audio_file)
+                    segments = transcriber.transcribe_locally(
+                        audio_samples if audio_samples is not None else temp_audio_file
+                    )
                     if not segments:
-                        segments = transcriber.transcribe_with_api(temp_audio_file)
+                        # The API needs a file upload
+                        if not temp_audio_file:
+                            temp_audio_file = self._extract_audio_file(input_video)
+                        if temp_audio_file:
+                            segments = transcriber.transcribe_with_api(temp_audio_file)
                 else:
                     logger.info("[TRANSCRIPTION] Captacity not available, using manual segments")
                     
@@ -122,29 +233,20 @@ class CaptionManager:
                 logger.warning(f"[WARNING] Transcription failed: {e}")
                 segments = None
             
+            # Audio is only needed for transcription
+            audio_samples = None
+            if temp_audio_file:
+                try:
+                    Path(temp_audio_file).unlink()
+                except:
+                    pass
+            
             # If transcription failed and we have a script, create manual segments
             if not segments and script:
                 logger.info("[MANUAL] Creating manual transcript from script...")
-                words = script.split()
-                word_duration = duration / len(words)
-                
-                word_segments = []
-                current_time = 0.0
-                
-                for word in words:
-                    word_segments.append({
-                        "word": " " + word,
-                        "start": current_time,
-                        "end": current_time + word_duration
-                    })
-                    current_time += word_duration
-                
-                segments = [{
-                    "start": 0.0,
-                    "end": duration,
-                    "words": word_segments
-                }]
-            elif not segments:
+                segments = self._create_manual_segments(script, duration)
+            
+            if not segments:
                 logger.error("[ERROR] No transcription or script available for captions")
                 return False
             
@@ -170,70 +272,76 @@ class CaptionManager:
             
             logger.info(f"[SEGMENTS] Created {len(captions)} caption segments")
             
-            clips = [video]
+            # Render with libass through FFmpeg when possible (no per-frame Python work)
+            renderer = self.caption_settings.get("renderer", "auto")
+            if renderer != "moviepy" and self.ffmpeg_path:
+                if self._render_captions_with_ffmpeg(input_video, output_video, captions, width, height):
+                    logger.info("[SUCCESS] Beautiful captions added successfully!")
+                    return True
+                logger.warning("[FFMPEG] ASS caption render failed, falling back to MoviePy")
+            
+            video = VideoFileClip(input_video)
             
-            # Create word-by-word highlighting captions (captacity style)
+            # Rasterize every caption's highlight frames up front; repeated captions
+            # (same text and word count) share one set of frames
+            font_size = self.caption_settings.get("font_size", 96)
+            caption_keys = dict.fromkeys((caption["text"], len(caption["words"])) for caption in captions)
+            rendered = {
+                key: self._render_caption_frames(key[0], key[1], width, height, font_size)
+                for key in caption_keys
+            }
+            
+            # Collect one (start, end, tile_y, frame) event per word highlight
+            events = []
             for caption in captions:
                 words = caption["words"]
                 caption_text = caption["text"]
+                tile_y, frames = rendered[(caption_text, len(words))]
                 
                 logger.info(f"[PROCESSING] Caption: '{caption_text}' with {len(words)} words")
                 
-                # Create individual clips for each word highlight
                 for i, word in enumerate(words):
                     if i + 1 < len(words):
                         word_end_time = words[i + 1]["start"]
                     else:
                         word_end_time = word["end"]
                     
-                    word_start_time = word["start"]
-                    word_duration = word_end_time - word_start_time
-                    
-                    # Create text image with current word highlighted
-                    text_img = self._create_text_image_with_word_highlight(
-                        text=caption_text,
-                        width=width,
-                        height=height,
-                        current_word_index=i,
-                        font_size=self.caption_settings.get("font_size", 96)
-                    )
-                    
-                    # Convert PIL image to numpy array
-                    text_array = np.array(text_img)
-                    
-                    # Create MoviePy ImageClip
-                    text_clip = ImageClip(text_array, transparent=True)
-                    text_clip = text_clip.set_start(word_start_time)
-                    text_clip = text_clip.set_duration(word_duration)
-                    text_clip = text_clip.set_position('center')
-                    
-                    clips.append(text_clip)
+                    events.append((word["start"], word_end_time, tile_y, frames[i]))
+            
+            events.sort(key=lambda event: event[0])
             
-            # Create final composite video
+            # Create final composite video: the base video plus ONE time-varying
+            # caption overlay instead of an ImageClip layer per word
             logger.info("[COMPOSITE] Creating composite video...")
-            final_video = CompositeVideoClip(clips)
+            if events:
+                overlay = self._create_caption_overlay(events, width, video.duration)
+                final_video = CompositeVideoClip([video, overlay])
+            else:
+                final_video = CompositeVideoClip([video])
             
-            # Write output
+            # Write output (hardware encoder when available)
             logger.info("[EXPORT] Writing video file...")
+            from moviepy.config import get_setting
+            encoder_settings = get_encoder_settings(
+                get_setting("FFMPEG_BINARY"),
+                codec=config.get("video.codec", "libx264"),
+                preset=self.caption_settings.get("preset", "ultrafast"),
+                hwaccel=config.get("video.hwaccel", "auto"),
+                quality=config.get("video.quality", 23)
+            )
             final_video.write_videofile(
                 output_video,
                 fps=config.get("video.fps", 24),
-                codec=config.get("video.codec", "libx264"),
                 audio_codec=config.get("video.audio_codec", "aac"),
                 temp_audiofile='temp-audio.m4a',
-                remove_temp=True
+                remove_temp=True,
+                **encoder_settings
             )
             
             # Cleanup
             video.close()
             final_video.close()
             
-            # Clean up temp audio file
-            try:
-                Path(temp_audio_file).unlink()
-            except:
-                pass
-            
             logger.info("[SUCCESS] Beautiful captions added successfully!")
             return True
             
@@ -243,6 +351,159 @@ class CaptionManager:
             logger.error(traceback.format_exc())
             return False
     
+    def _render_captions_with_ffmpeg(self, input_video: str, output_video: str,
+                                     captions: List[Dict], width: int, height: int) -> bool:
+        """Burn captions into the video with FFmpeg's ass filter (or mux them as soft subtitles)"""
+        try:
+            # PRGAVI_SOFT_SUBTITLES=1 overrides captions.burn_in
+            burn_in = self.caption_settings.get("burn_in", True)
+            if os.environ.get("PRGAVI_SOFT_SUBTITLES", "").lower() in ("1", "true", "yes"):
+                burn_in = False
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # FFmpeg runs inside temp_dir so the filter sees a plain relative
+                # file name (no drive-letter escaping on Windows)
+                self._write_ass_file(captions, width, height, Path(temp_dir) / "captions.ass")
+                
+                cmd = [
+                    self.ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-nostats', '-y',
+                    '-i', str(Path(input_video).resolve())
+                ]
+                
+                if burn_in:
+                    encoder_settings = get_encoder_settings(
+                        self.ffmpeg_path,
+                        codec=config.get("video.codec", "libx264"),
+                        preset=self.caption_settings.get("preset", "ultrafast"),
+                        hwaccel=config.get("video.hwaccel", "auto"),
+                        quality=config.get("video.quality", 23)
+                    )
+                    cmd.extend([
+                        '-vf', 'ass=captions.ass',
+                        '-c:v', encoder_settings["codec"],
+                        '-preset', encoder_settings["preset"]
+                    ])
+                    if encoder_settings.get("threads"):
+                        cmd.extend(['-threads', str(encoder_settings["threads"])])
+                    cmd.extend(encoder_settings.get("ffmpeg_params", []))
+                    # Audio is unchanged by captions, so copy it instead of re-encoding
+                    cmd.extend(['-c:a', 'copy'])
+                    logger.info(f"[FFMPEG] Burning captions with {encoder_settings['codec']}...")
+                else:
+                    # Remux only: no pixels are touched
+                    cmd.extend([
+                        '-i', 'captions.ass',
+                        '-map', '0:v', '-map', '0:a?', '-map', '1:s',
+                        '-c', 'copy', '-c:s', 'mov_text',
+                        '-metadata:s:s:0', 'language=eng',
+                        '-movflags', '+faststart'
+                    ])
+                    logger.info("[FFMPEG] Muxing captions as a soft subtitle track...")
+                
+                cmd.append(str(Path(output_video).resolve()))
+                subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                               check=True, cwd=temp_dir)
+            
+            return True
+            
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode('utf-8', errors='replace') if e.stderr else ""
+            logger.warning(f"[FFMPEG] Caption burn-in failed: {stderr.strip()[-500:]}")
+            return False
+        except Exception as e:
+            logger.warning(f"[FFMPEG] Caption burn-in failed: {e}")
+            return False
+    
+    def _write_ass_file(self, captions: List[Dict], width: int, height: int, ass_path: Path):
+        """Write captions as an ASS script with one event per highlighted word"""
+        font_size = self.caption_settings.get("font_size", 96)
+        # Same placement as the MoviePy renderer: just above the 60% image/video split
+        margin_v = height - int(height * 0.6) + 40
+        
+        lines = [
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            f"PlayResX: {width}",
+            f"PlayResY: {height}",
+            "WrapStyle: 2",
+            "ScaledBorderAndShadow: yes",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, "
+            "BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, "
+            "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+            f"Style: Default,Arial,{font_size},&H00FFFFFF,&H0000FFFF,&H00000000,&H4B000000,"
+            f"0,0,0,0,100,100,0,0,1,3,2,2,10,10,{margin_v},1",
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+        ]
+        
+        for caption in captions:
+            words = caption["words"]
+            # Drop ASS override characters from the spoken text
+            caption_words = [
+                w.replace("{", "").replace("}", "").replace("\\", "")
+                for w in caption["text"].split()
+            ]
+            
+            for i, word in enumerate(words):
+                if i + 1 < len(words):
+                    word_end_time = words[i + 1]["start"]
+                else:
+                    word_end_time = word["end"]
+                
+                # Current word in yellow, the rest in the style's white
+                text = " ".join(
+                    f"{{\\c&H00FFFF&}}{w}{{\\c&HFFFFFF&}}" if j == i else w
+                    for j, w in enumerate(caption_words)
+                )
+                lines.append(
+                    f"Dialogue: 0,{self._format_ass_time(word['start'])},"
+                    f"{self._format_ass_time(word_end_time)},Default,,0,0,0,,{text}"
+                )
+        
+        ass_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    
+    def _format_ass_time(self, seconds: float) -> str:
+        """Format seconds as an ASS timestamp (H:MM:SS.cc)"""
+        centiseconds = int(round(max(seconds, 0.0) * 100))
+        hours, centiseconds = divmod(centiseconds, 360000)
+        minutes, centiseconds = divmod(centiseconds, 6000)
+        secs, centiseconds = divmod(centiseconds, 100)
+        return f"{hours}:{minutes:02d}:{secs:02d}.{centiseconds:02d}"
+    
+    def _create_manual_segments(self, script: str, duration: float) -> List[Dict]:
+        """Create one timed segment per script sentence, weighting words by length"""
+        sentences = [sentence.split() for sentence in SENTENCE_SPLIT.split(script.strip())]
+        sentences = [words for words in sentences if words]
+        
+        # Longer words take longer to say; +1 accounts for the gap after each word.
+        # Boundaries come from one cumulative sum rather than a running float total
+        weights = np.fromiter((len(word) + 1 for words in sentences for word in words), dtype=np.float64)
+        if not weights.size:
+            return []
+        boundaries = np.concatenate(([0.0], np.cumsum(weights))) * (duration / weights.sum())
+        boundaries = boundaries.tolist()
+        
+        segments = []
+        index = 0
+        for words in sentences:
+            word_segments = [{
+                "word": " " + word,
+                "start": boundaries[index + i],
+                "end": boundaries[index + i + 1]
+            } for i, word in enumerate(words)]
+            index += len(words)
+            
+            segments.append({
+                "start": word_segments[0]["start"],
+                "end": word_segments[-1]["end"],
+                "words": word_segments
+            })
+        
+        return segments
+    
     def _create_manual_captions(self, segments: List[Dict], fits_frame=None) -> List[Dict]:
         """Create manual captions when segment_parser is not available with improved fit function"""
         captions = []
@@ -289,6 +550,52 @@ class CaptionManager:
         
         return captions
     
+    def _read_audio_samples(self, input_video: str) -> Optional[np.ndarray]:
+        """Decode the audio track through an FFmpeg pipe as 16 kHz mono float32 samples"""
+        try:
+            result = subprocess.run([
+                self.ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-nostats',
+                '-i', input_video, '-vn', '-f', 's16le', '-ac', '1', '-ar', '16000', '-'
+            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, 'stderr', None)
+            stderr = stderr.decode('utf-8', errors='replace').strip() if stderr else ""
+            logger.warning(f"[AUDIO] FFmpeg audio pipe failed: {e} {stderr}")
+            return None
+        
+        if not result.stdout:
+            logger.warning("[AUDIO] FFmpeg returned no audio samples")
+            return None
+        
+        # Whisper and faster-whisper both take float32 PCM in [-1, 1)
+        samples = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+        logger.info("[AUDIO] Decoded audio using FFmpeg pipe")
+        return samples
+    
+    def _extract_audio_file(self, input_video: str) -> Optional[str]:
+        """Extract audio to a temporary WAV file, returning its path"""
+        temp_audio_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False).name
+        
+        if self.ffmpeg_path:
+            # Use FFmpeg if available
+            try:
+                subprocess.run([
+                    self.ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-nostats',
+                    '-y', '-i', input_video, '-vn', temp_audio_file
+                ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+                logger.info("[AUDIO] Extracted audio using FFmpeg")
+                return temp_audio_file
+            except subprocess.CalledProcessError as e:
+                stderr = e.stderr.decode('utf-8', errors='replace').strip() if e.stderr else ""
+                logger.warning(f"[AUDIO] FFmpeg extraction failed: {e} {stderr}")
+        
+        # Use MoviePy as fallback
+        if self._extract_audio_with_moviepy(input_video, temp_audio_file):
+            return temp_audio_file
+        
+        Path(temp_audio_file).unlink(missing_ok=True)
+        return None
+    
     def _extract_audio_with_moviepy(self, input_video: str, output_audio: str) -> bool:
         """Extract audio using MoviePy as fallback"""
         try:
@@ -398,104 +705,109 @@ class CaptionManager:
             logger.error(f"Error creating caption clip: {e}")
             return None, None
     
-    def _create_text_image_with_word_highlight(self, text: str, width: int, height: int, 
-                                             current_word_index: int, font_size: int = 96) -> Image.Image:
-        """Create text image with captacity-style word highlighting - improved version"""
-        # Create transparent image
-        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Try to use a system font (matching improved implementation)
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            try:
-                font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
+    def _render_caption_base(self, text: str, width: int, height: int,
+                             font_size: int = 96) -> Tuple[Image.Image, int, List[Tuple[str, int, int]], ImageFont.ImageFont]:
+        """
+        Render a caption once with every word in white (captacity style)
         
-        # Split text into words
-        words = text.split()
+        Only a full-width strip around the text is allocated, not a full frame.
         
-        # Calculate text layout with line breaks (improved version)
-        lines = []
-        current_line = ""
-        max_chars_per_line = 25  # Reduced from 30 for better readability
+        Returns:
+            Tuple of (base_tile, tile_y, word_positions, font) where tile_y is the
+            tile's top edge in the video frame and word_positions holds (word, x, y)
+            for each drawn word in tile coordinates, in caption order
+        """
+        # System font, loaded once per size
+        font = _get_caption_font(font_size)
         
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if len(test_line) <= max_chars_per_line:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
+        # Layout is shared by every word frame (and every repeat of the same caption)
+        tile_y, tile_height, word_positions = _layout_caption(text, width, height, font_size)
         
-        if current_line:
-            lines.append(current_line)
+        # Create transparent tile covering the text plus room for the outline
+        img = Image.new('RGBA', (width, tile_height), (0, 0, 0, 0))
         
-        # Limit to 1 line max (improved captacity style)
-        lines = lines[:1]
-        
-        # Calculate vertical positioning (improved positioning)
-        # Video layout: 60% images at top, 40% video at bottom
-        image_section_height = int(height * 0.6)  # Top 60% is for images
-        line_height = font_size + 15
-        total_height = len(lines) * line_height
-        padding_from_bottom = 40  # Small padding from bottom of image section
-        start_y = image_section_height - total_height - padding_from_bottom  # Bottom of image section
-        
-        # Track word index across lines
-        word_counter = 0
-        
-        # Draw each line
-        for i, line in enumerate(lines):
-            line_words = line.split()
-            y_pos = start_y + i * line_height
-            
-            # Calculate starting x position for centering
-            bbox = draw.textbbox((0, 0), line, font=font)
-            line_width = bbox[2] - bbox[0]
-            start_x = (width - line_width) // 2
-            
-            # Draw word by word with proper highlighting
-            word_x = start_x
-            for word_idx, word in enumerate(line_words):
-                # Determine colors (captacity style)
-                if word_counter == current_word_index:
-                    main_color = (255, 255, 0, 255)  # Yellow for current word
-                else:
-                    main_color = (255, 255, 255, 255)  # White for other words
-                
-                outline_color = (0, 0, 0, 255)  # Black outline
-                
-                # Draw shadow/outline first (multiple layers for better effect)
-                shadow_offset = 2
-                outline_width = 3
-                
-                # Draw shadow
-                for dx in range(-shadow_offset, shadow_offset + 1):
-                    for dy in range(-shadow_offset, shadow_offset + 1):
-                        if dx != 0 or dy != 0:
-                            draw.text((word_x + dx, y_pos + dy), word, font=font, fill=(0, 0, 0, 180))
-                
-                # Draw black outline
-                for dx in range(-outline_width, outline_width + 1):
-                    for dy in range(-outline_width, outline_width + 1):
-                        if dx != 0 or dy != 0:
-                            draw.text((word_x + dx, y_pos + dy), word, font=font, fill=outline_color)
-                
-                # Draw main text
-                draw.text((word_x, y_pos), word, font=font, fill=main_color)
-                
-                # Calculate next word position
-                word_bbox = draw.textbbox((0, 0), word + " ", font=font)
-                word_width = word_bbox[2] - word_bbox[0]
-                word_x += word_width
-                word_counter += 1
+        # Draw word by word in white
+        for word, word_x, y_pos in word_positions:
+            self._draw_outlined_word(img, word, word_x, y_pos, font, (255, 255, 255, 255))
+        
+        return img, tile_y, list(word_positions), font
+    
+    def _create_caption_overlay(self, events: List[Tuple[float, float, int, np.ndarray]],
+                                width: int, duration: float) -> object:
+        """
+        Build a single masked VideoClip that shows the active highlight tile at each time
+        
+        Args:
+            events: (start, end, tile_y, rgba_tile) tuples sorted by start time
+            width: Video width
+            duration: Overlay duration
+        """
+        from moviepy.editor import VideoClip
+        
+        # The overlay spans the band covered by all tiles (normally one tile height)
+        band_top = min(event[2] for event in events)
+        band_bottom = max(event[2] + event[3].shape[0] for event in events)
+        band_height = band_bottom - band_top
+        blank = np.zeros((band_height, width, 4), dtype=np.uint8)
+        
+        starts = np.array([event[0] for event in events])
+        
+        def tile_at(t):
+            index = int(np.searchsorted(starts, t, side='right')) - 1
+            if index < 0 or t >= events[index][1]:
+                return blank
+            _, _, tile_y, tile = events[index]
+            if tile_y == band_top and tile.shape[0] == band_height:
+                return tile
+            frame = blank.copy()
+            frame[tile_y - band_top:tile_y - band_top + tile.shape[0]] = tile
+            return frame
+        
+        overlay = VideoClip(lambda t: tile_at(t)[:, :, :3], duration=duration)
+        mask = VideoClip(lambda t: tile_at(t)[:, :, 3] / 255.0, ismask=True, duration=duration)
+        return overlay.set_mask(mask).set_position((0, band_top))
+    
+    def _render_caption_frames(self, text: str, word_count: int, width: int, height: int,
+                               font_size: int = 96) -> Tuple[int, List[np.ndarray]]:
+        """
+        Render one highlight frame per word of a caption
+        
+        Returns:
+            Tuple of (tile_y, frames) where frames[i] is the RGBA tile with word i
+            highlighted, as a numpy array
+        """
+        # Render the white caption once; each frame only redraws the highlighted word
+        base_img, tile_y, word_positions, font = self._render_caption_base(
+            text=text,
+            width=width,
+            height=height,
+            font_size=font_size
+        )
         
+        # View each PIL image as a numpy array (the overlay only reads it)
+        frames = [
+            np.asarray(self._highlight_word(base_img, word_positions, font, i))
+            for i in range(word_count)
+        ]
+        return tile_y, frames
+    
+    def _highlight_word(self, base_img: Image.Image, word_positions: List[Tuple[str, int, int]],
+                        font: ImageFont.ImageFont, current_word_index: int) -> Image.Image:
+        """Copy a rendered caption base and redraw only the current word in yellow"""
+        img = base_img.copy()
+        if current_word_index < len(word_positions):
+            word, x, y = word_positions[current_word_index]
+            self._draw_outlined_word(img, word, x, y, font, (255, 255, 0, 255))
         return img
     
+    def _draw_outlined_word(self, img: Image.Image, word: str, x: int, y: int,
+                            font: ImageFont.ImageFont, main_color: Tuple[int, int, int, int]):
+        """Draw one word with a black outline"""
+        dx, dy, mask, outline = _outlined_word_masks(word, font)
+        origin = (x + dx, y + dy)
+        img.paste((0, 0, 0, 255), origin, outline)
+        img.paste(main_color, origin, mask)
+    
     def _load_font(self) -> ImageFont.ImageFont:
         """Load appropriate font for captions"""
         font_size = self.caption_settings.get("font_size", 80)
@@ -528,8 +840,7 @@ class CaptionManager:
         
         for word in words:
             test_line = current_line + (" " if current_line else "") + word
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            line_width = bbox[2] - bbox[0]
+            line_width = draw.textlength(test_line, font=font)
             
             if line_width <= width * 0.9:  # Leave some margin
                 current_line = test_line
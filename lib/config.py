@@ -36,7 +36,8 @@ class Config:
                 "codec": "libx264",
                 "audio_codec": "aac",
                 "preset": "faster",
-                "quality": 23
+                "quality": 23,
+                "hwaccel": "auto"
             },
             
             # TTS settings
@@ -45,7 +46,9 @@ class Config:
                 "exaggeration": 0.3,
                 "cfg_weight": 0.5,
                 "temperature": 0.85,
-                "words_per_minute": 180
+                "words_per_minute": 180,
+                "cache": True,
+                "cache_max_mb": 500
             },
             
             # Caption settings
@@ -57,7 +60,10 @@ class Config:
                 "stroke_width": 3,
                 "shadow_strength": 2.0,
                 "line_count": 1,
-                "padding": 60
+                "padding": 60,
+                "preset": "ultrafast",
+                "renderer": "auto",
+                "burn_in": True
             },
             
             # Asset settings
@@ -65,7 +71,9 @@ class Config:
                 "max_images": 15,
                 "min_file_size": 30000,
                 "image_formats": ["jpg", "jpeg", "png", "webp"],
-                "video_formats": ["mp4", "avi", "mov"]
+                "video_formats": ["mp4", "avi", "mov"],
+                "download_workers": 5,
+                "steam_cache_hours": 24
             },
             
             # Script settings
@@ -2,16 +2,45 @@
 Text-to-speech processing using Chatterbox
 """
 
+import os
 import logging
+import hashlib
+import shutil
+import struct
 import tempfile
 from pathlib import Path
 from typing import Optional, Tuple
 
 from .config import config
-from .utils import create_safe_name
+from .utils import create_safe_name, count_words, truncate_text_by_words
 
 logger = logging.getLogger(__name__)
 
+# Loaded Chatterbox models keyed by device; loading dominates time to first audio
+_chatterbox_models = {}
+
+def _wav_duration(path: Path) -> float:
+    """Read a WAV file's duration from its header (PCM or float, unlike the wave module)"""
+    with open(path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"Not a WAV file: {path}")
+        
+        byte_rate = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"WAV file has no data chunk: {path}")
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            if chunk_id == b'data':
+                if not byte_rate:
+                    raise ValueError(f"WAV data before fmt chunk: {path}")
+                return chunk_size / byte_rate
+            
+            chunk = f.read(chunk_size + (chunk_size & 1))  # Chunks are word aligned
+            if chunk_id == b'fmt ':
+                byte_rate = struct.unpack('<I', chunk[8:12])[0]
+
 class TTSProcessor:
     """Handles text-to-speech generation using Chatterbox"""
     
@@ -35,44 +64,11 @@ class TTSProcessor:
             return False, None, 0.0
         
         try:
-            # Import TTS dependencies
-            from chatterbox.tts import ChatterboxTTS
-            import torch
-            import torchaudio
-            
             logger.info("[TTS] Generating TTS audio...")
             
-            # Setup device and patch torch.load for CPU compatibility
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            logger.info(f"Using device: {device}")
-            
-            # Patch torch.load to force CPU mapping if CUDA is not available
-            if not torch.cuda.is_available():
-                original_load = torch.load
-                def patched_load(*args, **kwargs):
-                    kwargs['map_location'] = torch.device('cpu')
-                    return original_load(*args, **kwargs)
-                torch.load = patched_load
-                logger.info("[TTS] Patched torch.load for CPU compatibility")
-            
-            # Load model
-            model = ChatterboxTTS.from_pretrained(device=device)
-            
-            # Restore original torch.load if we patched it
-            if not torch.cuda.is_available() and 'original_load' in locals():
-                torch.load = original_load
-            
             # Clean script for better TTS
             clean_script = script.replace('\n', ' ').strip()
             
-            # Generate audio with configured settings
-            wav = model.generate(
-                clean_script,
-                exaggeration=self.model_settings.get("exaggeration", 0.3),
-                cfg_weight=self.model_settings.get("cfg_weight", 0.5),
-                temperature=self.model_settings.get("temperature", 0.85)
-            )
-            
             # Create output path
             if game_name:
                 safe_name = create_safe_name(game_name)
@@ -83,13 +79,43 @@ class TTSProcessor:
             # Ensure temp directory exists
             self.temp_dir.mkdir(parents=True, exist_ok=True)
             
-            # Save audio
-            torchaudio.save(str(output_path), wav, model.sr)
+            # Reuse narration already generated for this exact script and settings
+            cache_path = self._get_cache_path(clean_script)
+            if cache_path and cache_path.is_file():
+                shutil.copyfile(cache_path, output_path)
+                os.utime(cache_path)  # Mark as recently used for pruning
+                logger.info(f"[TTS] Reusing cached narration: {cache_path.name}")
+            else:
+                # Heavy model dependencies are only needed on a cache miss
+                import torch
+                import torchaudio
+                
+                # Setup device
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                logger.info(f"Using device: {device}")
+                
+                # Load model (cached for the lifetime of the process)
+                model = self._load_model(device)
+                
+                # Generate audio with configured settings
+                wav = model.generate(
+                    clean_script,
+                    exaggeration=self.model_settings.get("exaggeration", 0.3),
+                    cfg_weight=self.model_settings.get("cfg_weight", 0.5),
+                    temperature=self.model_settings.get("temperature", 0.85)
+                )
+                
+                # Save audio
+                torchaudio.save(str(output_path), wav, model.sr)
+                
+                if cache_path and output_path.exists():
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(output_path, cache_path)
+                    self._prune_cache(cache_path.parent)
             
             # Verify file exists and get duration
             if output_path.exists():
-                info = torchaudio.info(str(output_path))
-                duration = info.num_frames / info.sample_rate
+                duration = _wav_duration(output_path)
                 
                 logger.info(f"[SUCCESS] TTS audio created: {duration:.1f}s at {output_path}")
                 return True, str(output_path), duration
@@ -106,10 +132,69 @@ class TTSProcessor:
             logger.info("[FALLBACK] Attempting alternative TTS method...")
             return self._fallback_tts_generation(script, game_name)
     
+    def _get_cache_path(self, clean_script: str) -> Optional[Path]:
+        """Get the narration cache file for a script, keyed by content and voice settings"""
+        if not self.model_settings.get("cache", True):
+            return None
+        
+        key_source = "|".join([
+            self.model_settings.get("model", "chatterbox"),
+            str(self.model_settings.get("exaggeration", 0.3)),
+            str(self.model_settings.get("cfg_weight", 0.5)),
+            str(self.model_settings.get("temperature", 0.85)),
+            clean_script
+        ])
+        digest = hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+        return self.temp_dir / "tts_cache" / f"{digest}.wav"
+    
+    def _prune_cache(self, cache_dir: Path):
+        """Delete least recently used narrations once the cache exceeds tts.cache_max_mb"""
+        max_bytes = self.model_settings.get("cache_max_mb", 500) * 1024 * 1024
+        try:
+            entries = [(entry.stat(), entry) for entry in cache_dir.glob("*.wav")]
+        except OSError:
+            return
+        
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime):
+            if total <= max_bytes:
+                break
+            try:
+                entry.unlink()
+                total -= stat.st_size
+            except OSError as e:
+                logger.warning(f"Failed to prune cached narration {entry.name}: {e}")
+    
+    def _load_model(self, device: str):
+        """Load the Chatterbox model once per device and reuse it"""
+        if device in _chatterbox_models:
+            return _chatterbox_models[device]
+        
+        from chatterbox.tts import ChatterboxTTS
+        import torch
+        
+        # Patch torch.load to force CPU mapping if CUDA is not available
+        original_load = torch.load
+        if device == "cpu":
+            def patched_load(*args, **kwargs):
+                kwargs['map_location'] = torch.device('cpu')
+                return original_load(*args, **kwargs)
+            torch.load = patched_load
+            logger.info("[TTS] Patched torch.load for CPU compatibility")
+        
+        try:
+            model = ChatterboxTTS.from_pretrained(device=device)
+        finally:
+            # Restore original torch.load if we patched it
+            torch.load = original_load
+        
+        _chatterbox_models[device] = model
+        return model
+    
     def estimate_duration(self, text: str) -> float:
         """Estimate speech duration in seconds"""
         words_per_minute = self.model_settings.get("words_per_minute", 180)
-        word_count = len(text.split())
+        word_count = count_words(text)
         duration_minutes = word_count / words_per_minute
         return duration_minutes * 60
     
@@ -125,18 +210,12 @@ class TTSProcessor:
         words_per_second = words_per_minute / 60
         target_words = int(target_duration * words_per_second)
         
-        words = script.split()
-        if len(words) > target_words:
-            # Truncate and try to end on complete sentence
-            truncated = ' '.join(words[:target_words])
-            sentences = truncated.split('.')
-            if len(sentences) > 1:
-                truncated = '. '.join(sentences[:-1]) + '.'
-            
-            logger.info(f"Adjusted script from {len(words)} to {len(truncated.split())} words")
-            return truncated
+        # Truncate and try to end on complete sentence
+        truncated = truncate_text_by_words(script, target_words)
+        if truncated is not script:
+            logger.info(f"Adjusted script from {count_words(script)} to {count_words(truncated)} words")
         
-        return script
+        return truncated
     
     def _fallback_tts_generation(self, script: str, game_name: Optional[str] = None) -> Tuple[bool, Optional[str], float]:
         """Fallback TTS generation using pyttsx3 or creating a placeholder"""
@@ -233,8 +312,8 @@ Or install pyttsx3 for basic TTS:
     def cleanup_audio_file(self, audio_path: str):
         """Clean up temporary audio file"""
         try:
-            if audio_path and Path(audio_path).exists():
-                Path(audio_path).unlink()
+            if audio_path:
+                Path(audio_path).unlink(missing_ok=True)
                 logger.debug(f"Cleaned up audio file: {audio_path}")
         except Exception as e:
             logger.warning(f"Failed to cleanup audio file {audio_path}: {e}")
@@ -4,22 +4,75 @@ Shared utility functions for PRGAVI
 
 import os
 import re
+import json
+import time
+import random
+import shutil
+import string
 import logging
+import threading
+import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+
+from .config import config
 
 logger = logging.getLogger(__name__)
 
+# Steam URL patterns, compiled once (validation runs on every GUI keystroke)
+STEAM_URL_RE = re.compile(
+    r'https?://store\.steampowered\.com/app/\d+/'
+    r'|https?://steamcommunity\.com/app/\d+'
+    r'|steampowered\.com/app/\d+'
+)
+STEAM_APP_ID_RE = re.compile(r'/app/(\d+)/')
+STEAM_GAME_SLUG_RE = re.compile(r'/app/\d+/([^/?]+)')
+SLUG_SEPARATOR_RE = re.compile(r'[_-]+')
+WORD_RE = re.compile(r'\S+')
+UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?* _-]+')
+
+# Downloads are retried on rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+# Politeness budget for Steam's CDN, shared by all download threads
+# (requests per second, burst size)
+DOWNLOAD_RATE = 4.0
+DOWNLOAD_BURST = 5
+
+# Streamed downloads are written in 64 KiB blocks
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Shared keep-alive session so parallel downloads reuse TLS connections to the CDN
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers["User-Agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+# One pooled connection per download worker, plus one for the trailer
+HTTP_SESSION.mount("https://", HTTPAdapter(
+    pool_maxsize=max(1, config.get("assets.download_workers", 5)) + 1
+))
+
+# Hardware H.264 encoders keyed by PRGAVI_HWACCEL / video.hwaccel value,
+# with the preset each encoder accepts (VideoToolbox has no presets; FFmpeg
+# only warns about the unused option)
+HARDWARE_ENCODERS = {
+    "cuda": ("h264_nvenc", "p4"),
+    "qsv": ("h264_qsv", "faster"),
+    "videotoolbox": ("h264_videotoolbox", "medium"),
+    "amf": ("h264_amf", "balanced"),
+}
+
+# Encoder probe results are reused across runs until the FFmpeg binary changes or this expires
+ENCODER_PROBE_TTL = 7 * 24 * 3600
+
 def create_safe_name(name: str) -> str:
     """Create a safe filename from game name by removing illegal characters"""
-    # Remove illegal characters and replace with underscores
-    safe = re.sub(r'[<>:"/\\|?*]', '_', name)
-    # Replace spaces and dashes with underscores
-    safe = safe.replace(' ', '_').replace('-', '_')
-    # Remove multiple consecutive underscores
-    safe = re.sub(r'_+', '_', safe)
+    # Replace illegal characters, spaces and dashes, collapsing runs to one underscore
+    safe = UNSAFE_FILENAME_RE.sub('_', name)
     # Convert to lowercase and strip underscores from ends
     return safe.lower().strip('_')
 
@@ -49,82 +102,130 @@ def validate_steam_url(url: str) -> bool:
     if not url:
         return False
     
-    steam_patterns = [
-        r'https?://store\.steampowered\.com/app/\d+/',
-        r'https?://steamcommunity\.com/app/\d+',
-        r'steampowered\.com/app/\d+'
-    ]
-    
-    return any(re.search(pattern, url) for pattern in steam_patterns)
+    return STEAM_URL_RE.search(url) is not None
 
 def extract_steam_app_id(url: str) -> Optional[str]:
     """Extract Steam App ID from URL"""
     if not url:
         return None
         
-    match = re.search(r'/app/(\d+)/', url)
+    match = STEAM_APP_ID_RE.search(url)
     return match.group(1) if match else None
 
 def extract_game_name_from_url(steam_url: str) -> str:
     """Extract game name from Steam URL"""
     try:
         # Try to extract from URL path
-        match = re.search(r'/app/\d+/([^/?]+)', steam_url)
+        match = STEAM_GAME_SLUG_RE.search(steam_url)
         if match:
-            game_name = match.group(1).replace('_', ' ').replace('-', ' ')
             # Clean up and capitalize
-            game_name = ' '.join(word.capitalize() for word in game_name.split())
-            return game_name
+            return string.capwords(SLUG_SEPARATOR_RE.sub(' ', match.group(1)))
     except Exception:
         pass
     return "Unknown Game"
 
-def download_file(url: str, destination: Path, timeout: int = 30) -> bool:
-    """Download a file from URL to destination"""
-    try:
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-        response = requests.get(url, stream=True, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        
-        # Ensure destination directory exists
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-        
-        with open(destination, 'wb') as file:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    file.write(chunk)
-                    downloaded += len(chunk)
-                    
-                    if total_size > 0:
-                        progress = downloaded / total_size * 100
-                        print(f"\rDownloading {destination.name}: {progress:.1f}%", end='', flush=True)
-        
-        if total_size > 0:
-            print()  # New line after progress
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks only when the budget is spent"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, waiting for a refill if none are left"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+DOWNLOAD_RATE_LIMIT = TokenBucket(DOWNLOAD_RATE, DOWNLOAD_BURST)
+
+def download_file(url: str, destination: Path, timeout: int = 30, max_retries: int = 4,
+                  show_progress: bool = True) -> bool:
+    """Download a file from URL to destination, backing off on rate limits and server errors"""
+    part_path = destination.with_name(destination.name + ".part")
+    
+    for attempt in range(max_retries + 1):
+        try:
+            DOWNLOAD_RATE_LIMIT.acquire()
+            response = HTTP_SESSION.get(url, stream=True, timeout=timeout)
             
-        logger.info(f"[DOWNLOAD] Downloaded: {destination}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"[ERROR] Download failed {destination}: {e}")
-        return False
+            if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+                delay = _retry_delay(attempt, response.headers.get("Retry-After"))
+                response.close()
+                logger.warning(f"[RETRY] {destination.name}: HTTP {response.status_code}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            
+            response.raise_for_status()
+            
+            # Ensure destination directory exists
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            
+            total_size = int(response.headers.get('content-length', 0))
+            downloaded = 0
+            
+            # Write to a side file and rename on completion so an interrupted
+            # download never leaves a truncated file under the final name
+            with open(part_path, 'wb') as file:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        file.write(chunk)
+                        downloaded += len(chunk)
+                        
+                        if show_progress and total_size > 0:
+                            progress = downloaded / total_size * 100
+                            print(f"\rDownloading {destination.name}: {progress:.1f}%", end='', flush=True)
+            
+            if show_progress and total_size > 0:
+                print()  # New line after progress
+            
+            part_path.replace(destination)
+            logger.info(f"[DOWNLOAD] Downloaded: {destination}")
+            return True
+            
+        except (requests.ConnectionError, requests.Timeout) as e:
+            part_path.unlink(missing_ok=True)
+            if attempt < max_retries:
+                delay = _retry_delay(attempt)
+                logger.warning(f"[RETRY] {destination.name}: {e}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            logger.error(f"[ERROR] Download failed {destination}: {e}")
+            return False
+        except Exception as e:
+            part_path.unlink(missing_ok=True)
+            logger.error(f"[ERROR] Download failed {destination}: {e}")
+            return False
+    
+    return False
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Exponential backoff with full jitter, honoring a numeric Retry-After header up to RETRY_MAX_DELAY"""
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
 
 def get_file_size_mb(file_path: Path) -> float:
     """Get file size in megabytes"""
-    if file_path.exists():
+    try:
         return file_path.stat().st_size / (1024 * 1024)
-    return 0.0
+    except OSError:
+        return 0.0
 
 def cleanup_files(file_paths: List[Path], ignore_errors: bool = True):
     """Clean up multiple files"""
     for file_path in file_paths:
         try:
-            if file_path.exists():
-                file_path.unlink()
-                logger.debug(f"Cleaned up: {file_path}")
+            file_path.unlink(missing_ok=True)
+            logger.debug(f"Cleaned up: {file_path}")
         except Exception as e:
             if not ignore_errors:
                 raise
@@ -136,18 +237,27 @@ def estimate_duration(text: str, words_per_minute: int = 180) -> float:
     duration_minutes = word_count / words_per_minute
     return duration_minutes * 60
 
+def count_words(text: str) -> int:
+    """Count whitespace-separated words"""
+    return len(text.split())
+
 def truncate_text_by_words(text: str, max_words: int) -> str:
     """Truncate text to maximum word count"""
-    words = text.split()
-    if len(words) <= max_words:
+    # Find where the last allowed word ends, scanning no further than needed
+    end = 0
+    for count, match in enumerate(WORD_RE.finditer(text)):
+        if count == max_words:
+            break
+        end = match.end()
+    else:
         return text
     
-    truncated = ' '.join(words[:max_words])
+    truncated = text[:end]
     
     # Try to end on a complete sentence
-    sentences = truncated.split('.')
-    if len(sentences) > 1:
-        return '. '.join(sentences[:-1]) + '.'
+    last_period = truncated.rfind('.')
+    if last_period > 0:
+        return truncated[:last_period + 1]
     
     return truncated
 
@@ -173,23 +283,146 @@ def format_timestamp() -> str:
     """Get current timestamp as string"""
     return datetime.now().strftime('%Y%m%d_%H%M%S')
 
+def detect_media_type(file_path: Path) -> Optional[str]:
+    """Identify a media file from its leading magic bytes ("image", "audio", "video" or None)"""
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(12)
+    except OSError:
+        return None
+    
+    if head.startswith((b'\xff\xd8\xff', b'\x89PNG')) or (head[:4] == b'RIFF' and head[8:12] == b'WEBP'):
+        return "image"
+    if (head[:4] == b'RIFF' and head[8:12] == b'WAVE') or (head[:4] == b'FORM' and head[8:12] in (b'AIFF', b'AIFC')) \
+            or head.startswith((b'ID3', b'fLaC', b'OggS')):
+        return "audio"
+    if head[4:8] == b'ftyp' or head.startswith(b'\x1a\x45\xdf\xa3') or (head[:4] == b'RIFF' and head[8:12] == b'AVI '):
+        return "video"
+    return None
+
 def is_valid_image_file(file_path: Path, min_size: int = 30000) -> bool:
     """Check if file is a valid image with minimum size"""
-    if not file_path.exists():
-        return False
-        
-    # Check file size
-    if file_path.stat().st_size < min_size:
+    # Single stat covers both existence and size
+    try:
+        if file_path.stat().st_size < min_size:
+            return False
+    except OSError:
         return False
         
-    # Check file extension
+    # Check file extension and content signature
     valid_extensions = {'.jpg', '.jpeg', '.png', '.webp'}
-    return file_path.suffix.lower() in valid_extensions
+    return file_path.suffix.lower() in valid_extensions and detect_media_type(file_path) == "image"
 
 def is_valid_video_file(file_path: Path) -> bool:
     """Check if file is a valid video"""
-    if not file_path.exists():
+    if not file_path.is_file():
         return False
         
     valid_extensions = {'.mp4', '.avi', '.mov', '.mkv'}
-    return file_path.suffix.lower() in valid_extensions
\ No newline at end of file
+    return file_path.suffix.lower() in valid_extensions
+
+@lru_cache(maxsize=None)
+def _probe_encoder(ffmpeg_binary: str, encoder: str, preset: str) -> bool:
+    """
+    Check that FFmpeg can actually open an encoder (not just list it)
+    
+    Results are stored in temp/encoder_probes.json, so later runs skip the
+    test encode until the FFmpeg binary changes or ENCODER_PROBE_TTL passes.
+    """
+    binary = shutil.which(ffmpeg_binary) or ffmpeg_binary
+    try:
+        binary_mtime = os.stat(binary).st_mtime_ns
+    except OSError:
+        binary_mtime = 0
+    key = f"{binary}|{binary_mtime}|{encoder}|{preset}"
+    
+    cache_file = config.get_directory("temp") / "encoder_probes.json"
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            probes = json.load(f)
+    except (OSError, ValueError):
+        probes = {}
+    
+    cached = probes.get(key)
+    if cached and time.time() - cached.get("checked", 0) < ENCODER_PROBE_TTL:
+        return bool(cached.get("ok"))
+    
+    try:
+        result = subprocess.run([
+            ffmpeg_binary, '-hide_banner', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+            '-c:v', encoder, '-preset', preset, '-f', 'null', '-'
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+        ok = result.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+    
+    probes[key] = {"ok": ok, "checked": time.time()}
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(probes, f)
+        temp_file.replace(cache_file)
+    except OSError as e:
+        logger.debug(f"Failed to cache encoder probe: {e}")
+    
+    return ok
+
+def detect_hardware_encoder(ffmpeg_binary: str = "ffmpeg", hwaccel: str = "auto") -> Optional[str]:
+    """
+    Detect a usable hardware H.264 encoder
+    
+    The PRGAVI_HWACCEL environment variable overrides the hwaccel argument.
+    Accepted values are "auto", "none" or a key of HARDWARE_ENCODERS.
+    
+    Returns:
+        Key of HARDWARE_ENCODERS or None for software encoding
+    """
+    hwaccel = os.environ.get("PRGAVI_HWACCEL", hwaccel or "auto").lower()
+    if hwaccel == "none":
+        return None
+    
+    candidates = list(HARDWARE_ENCODERS) if hwaccel == "auto" else [hwaccel]
+    for name in candidates:
+        if name not in HARDWARE_ENCODERS:
+            logger.warning(f"[ENCODER] Unknown hwaccel '{name}', using software encoding")
+            continue
+        encoder, preset = HARDWARE_ENCODERS[name]
+        if _probe_encoder(ffmpeg_binary, encoder, preset):
+            logger.info(f"[ENCODER] Using hardware encoder: {encoder}")
+            return name
+    
+    return None
+
+def get_encoder_settings(ffmpeg_binary: str, codec: str = "libx264",
+                         preset: str = "faster", hwaccel: str = "auto",
+                         quality: Optional[int] = None) -> Dict:
+    """Get write_videofile encoder arguments, preferring a hardware encoder"""
+    hw_name = detect_hardware_encoder(ffmpeg_binary, hwaccel) if codec == "libx264" else None
+    params = []
+    if hw_name:
+        encoder, hw_preset = HARDWARE_ENCODERS[hw_name]
+        settings = {"codec": encoder, "preset": hw_preset}
+        if quality is not None:
+            if hw_name == "cuda":
+                params = ["-rc", "vbr", "-cq", str(quality), "-b:v", "0"]
+            elif hw_name == "videotoolbox":
+                # -q:v runs 1-100 (higher is better); CRF 23 maps to about 55
+                params = ["-q:v", str(max(1, min(100, 100 - 2 * quality)))]
+            elif hw_name == "amf":
+                params = ["-rc", "cqp", "-qp_i", str(quality), "-qp_p", str(quality)]
+            else:
+                params = ["-global_quality", str(quality)]
+        # Force 8-bit 4:2:0 output, which phones and Shorts players require
+        # (QSV only takes nv12, the same layout interleaved)
+        params += ["-pix_fmt", "nv12" if hw_name == "qsv" else "yuv420p"]
+    else:
+        # Let x264 use every logical core instead of its conservative default
+        settings = {"codec": codec, "preset": preset, "threads": os.cpu_count() or 1}
+        if quality is not None and codec == "libx264":
+            params = ["-crf", str(quality)]
+    
+    # Put the moov atom first so the MP4 can start playing before it is fully downloaded
+    settings["ffmpeg_params"] = params + ["-movflags", "+faststart"]
+    return settings
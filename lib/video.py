@@ -4,12 +4,13 @@ Video processing and creation functionality
 
 import logging
 import time
+import tempfile
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple
-from PIL import Image
+from PIL import Image, ImageOps
 
 from .config import config
-from .utils import create_safe_name, cleanup_files, get_file_size_mb
+from .utils import create_safe_name, cleanup_files, get_file_size_mb, detect_media_type, get_encoder_settings
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +52,11 @@ class VideoProcessor:
             
             logger.info(f"[VIDEO] Creating video for {game_name} in {video_mode} mode")
             
+            # TTS may have fallen back to a text placeholder instead of real audio
+            if detect_media_type(Path(audio_path)) != "audio":
+                logger.error(f"[ERROR] Not an audio file (TTS placeholder?): {audio_path}")
+                return None
+            
             # Get audio duration
             info = torchaudio.info(audio_path)
             audio_duration = info.num_frames / info.sample_rate
@@ -85,14 +91,21 @@ class VideoProcessor:
             output_filename = f"{safe_name}{mode_suffix}.mp4"
             output_path = self.output_dir / output_filename
             
-            # Export video
+            # Export video (hardware encoder when available)
             logger.info("[EXPORT] Exporting video...")
+            from moviepy.config import get_setting
+            encoder_settings = get_encoder_settings(
+                get_setting("FFMPEG_BINARY"),
+                codec=self.video_settings.get("codec", "libx264"),
+                preset=self.video_settings.get("preset", "faster"),
+                hwaccel=self.video_settings.get("hwaccel", "auto"),
+                quality=self.video_settings.get("quality", 23)
+            )
             final_video.write_videofile(
                 str(output_path),
                 fps=self.video_settings.get("fps", 30),
-                codec=self.video_settings.get("codec", "libx264"),
                 audio_codec=self.video_settings.get("audio_codec", "aac"),
-                preset=self.video_settings.get("preset", "faster")
+                **encoder_settings
             )
             
             # Cleanup
@@ -119,9 +132,7 @@ class VideoProcessor:
                              video_start_time: int) -> Optional[object]:
         """Create standard video with cropping/scaling"""
         try:
-            from moviepy.editor import (
-                VideoFileClip, ImageClip, CompositeVideoClip, concatenate_videoclips
-            )
+            from moviepy.editor import VideoFileClip, ImageClip, CompositeVideoClip
             
             # Calculate layout
             top_height = int(height * 0.6)  # 60% for images
@@ -138,10 +149,9 @@ class VideoProcessor:
                 if video_clip.duration > video_start_time:
                     video_clip = video_clip.subclip(video_start_time)
                 
-                # Loop if needed
+                # Loop if needed (wraps time on the source instead of concatenating copies)
                 if video_clip.duration < duration + 5:
-                    loop_count = int((duration + 5) / video_clip.duration) + 1
-                    video_clip = concatenate_videoclips([video_clip] * loop_count)
+                    video_clip = video_clip.loop(duration=duration + 5)
                 
                 # Resize and crop for bottom section
                 video_clip = video_clip.resize(height=bottom_height)
@@ -169,36 +179,34 @@ class VideoProcessor:
                                         video_start_time: int) -> Optional[object]:
         """Create 4X strategy game video with black bands (no cropping)"""
         try:
-            from moviepy.editor import (
-                VideoFileClip, ImageClip, CompositeVideoClip, concatenate_videoclips
-            )
+            from moviepy.editor import VideoFileClip, ImageClip, CompositeVideoClip
             
             # Calculate layout
             top_height = int(height * 0.6)
             bottom_height = height - top_height
             
-            # Create image slideshow with black bands
-            processed_images = []
-            temp_files = []
-            
-            for i, img_path in enumerate(images):
-                try:
-                    # Process image with black bands
-                    processed_path = self._resize_with_black_bands(
-                        img_path, width, top_height, i
-                    )
-                    if processed_path:
-                        processed_images.append(processed_path)
-                        temp_files.append(processed_path)
-                except Exception as e:
-                    logger.warning(f"Failed to process image {img_path}: {e}")
-            
-            if not processed_images:
-                logger.error("No processed images available")
-                return None
-            
-            # Create slideshow from processed images
-            image_clips = self._create_image_slideshow(processed_images, duration, width, top_height)
+            # Create image slideshow with black bands. ImageClip reads each file
+            # when it is built, so the processed copies only live for this step.
+            with tempfile.TemporaryDirectory(dir=self.temp_dir, prefix="4x_images_") as run_dir:
+                processed_images = []
+                
+                for i, img_path in enumerate(images):
+                    try:
+                        # Process image with black bands
+                        processed_path = self._resize_with_black_bands(
+                            img_path, width, top_height, i, Path(run_dir)
+                        )
+                        if processed_path:
+                            processed_images.append(processed_path)
+                    except Exception as e:
+                        logger.warning(f"Failed to process image {img_path}: {e}")
+                
+                if not processed_images:
+                    logger.error("No processed images available")
+                    return None
+                
+                # Create slideshow from processed images
+                image_clips = self._create_image_slideshow(processed_images, duration, width, top_height)
             
             # Process background video with black bands
             if video_path and Path(video_path).exists():
@@ -208,10 +216,9 @@ class VideoProcessor:
                 if video_clip.duration > video_start_time:
                     video_clip = video_clip.subclip(video_start_time)
                 
-                # Loop if needed
+                # Loop if needed (wraps time on the source instead of concatenating copies)
                 if video_clip.duration < duration + 5:
-                    loop_count = int((duration + 5) / video_clip.duration) + 1
-                    video_clip = concatenate_videoclips([video_clip] * loop_count)
+                    video_clip = video_clip.loop(duration=duration + 5)
                 
                 # Resize with black bands for bottom section
                 video_aspect = video_clip.w / video_clip.h
@@ -241,11 +248,6 @@ class VideoProcessor:
             else:
                 final_clip = CompositeVideoClip([image_clips], size=(width, height), bg_color=(0, 0, 0))
             
-            # Schedule cleanup of temporary files
-            if temp_files:
-                # Note: In production, you'd want to clean these up after video export
-                pass
-            
             return final_clip
             
         except Exception as e:
@@ -297,42 +299,27 @@ class VideoProcessor:
             return ColorClip(size=(width, height), color=(20, 20, 20), duration=duration)
     
     def _resize_with_black_bands(self, image_path: str, target_width: int, 
-                               target_height: int, index: int) -> Optional[str]:
+                               target_height: int, index: int,
+                               output_dir: Optional[Path] = None) -> Optional[str]:
         """Resize image with black bands to preserve aspect ratio"""
         try:
             # Load image
             with Image.open(image_path) as img:
+                # Let the JPEG decoder downscale while decoding (no-op for other formats)
+                img.draft('RGB', (target_width, target_height))
+                
                 # Convert to RGB if necessary
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
                 
-                # Calculate scaling
-                original_width, original_height = img.size
-                target_ratio = target_width / target_height
-                original_ratio = original_width / original_height
-                
-                if original_ratio > target_ratio:
-                    # Image is wider - fit to width
-                    new_width = target_width
-                    new_height = int(target_width / original_ratio)
-                else:
-                    # Image is taller - fit to height
-                    new_height = target_height
-                    new_width = int(target_height * original_ratio)
-                
-                # Resize image
-                resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-                # Create black canvas
-                final_img = Image.new('RGB', (target_width, target_height), (0, 0, 0))
-                
-                # Center the resized image
-                x_offset = (target_width - new_width) // 2
-                y_offset = (target_height - new_height) // 2
-                final_img.paste(resized_img, (x_offset, y_offset))
+                # Fit inside the target and center on a black canvas in one step
+                final_img = ImageOps.pad(
+                    img, (target_width, target_height),
+                    method=Image.Resampling.LANCZOS, color=(0, 0, 0)
+                )
                 
                 # Save processed image
-                output_path = self.temp_dir / f"processed_img_{index}_{int(time.time())}.jpg"
+                output_path = (output_dir or self.temp_dir) / f"processed_img_{index}_{int(time.time())}.jpg"
                 final_img.save(output_path, 'JPEG', quality=95)
                 
                 return str(output_path)
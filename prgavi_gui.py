@@ -7,12 +7,16 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
 import subprocess
+import queue
+import atexit
 import sys
 import os
 from pathlib import Path
 import tempfile
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import urllib.parse
 
@@ -20,6 +24,71 @@ import urllib.parse
 sys.path.insert(0, str(Path(__file__).parent / "lib"))
 
 from lib import validate_steam_url, extract_game_name_from_url
+from lib.utils import count_words
+
+# Resolved once; every creator run and catalog lookup reuses this command prefix
+PROJECT_DIR = Path(__file__).resolve().parent
+UNIFIED_SCRIPT = PROJECT_DIR / "prgavi_unified.py"
+CREATOR_COMMAND = (sys.executable, str(UNIFIED_SCRIPT))
+
+# Oldest log lines are dropped beyond this many
+MAX_LOG_LINES = 2000
+
+# Scripts are requested at about this length. English runs ~1.3 tokens per
+# word, so the token budget leaves a little headroom over the target instead of
+# paying for a long tail. Streamed output is also cut off at the word count that
+# budget corresponds to, for models whose tokenizer packs more words per token.
+SCRIPT_TARGET_WORDS = 80
+SCRIPT_MAX_TOKENS = int(SCRIPT_TARGET_WORDS * 1.4) + 16
+MAX_SCRIPT_WORDS = int(SCRIPT_MAX_TOKENS / 1.3)
+
+# Static script-generation instructions. They open every request so providers
+# with prompt-prefix caching can reuse them; only the game info varies.
+SCRIPT_WRITER_SYSTEM_PROMPT = (
+    "You are a professional YouTube Shorts script writer. Return ONLY the script text "
+    "with no additional commentary, explanations, or formatting. Keep scripts under "
+    "80 words for 30-second videos.\n"
+    "\n"
+    "CRITICAL REQUIREMENTS:\n"
+    "- Write ONLY the script - no explanations, comments, or extra text\n"
+    "- Maximum 30 seconds when read aloud (approximately 75-80 words)\n"
+    "- Start with an immediate hook in first 3 seconds\n"
+    "- End with a call to action\n"
+    "- Make it punchy and engaging for YouTube Shorts"
+)
+
+# Script generations share one keep-alive connection pool to OpenRouter so
+# regenerating skips the TCP/TLS handshake. Rate limits and transient server
+# errors are retried with backoff before the error is shown.
+OPENROUTER_SESSION = requests.Session()
+OPENROUTER_SESSION.mount("https://", HTTPAdapter(
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False
+    )
+))
+
+# Markdown and whitespace cleanup applied to every generated script
+MARKDOWN_PATTERNS = (
+    re.compile(r'\*\*(.*?)\*\*'),  # **bold**
+    re.compile(r'\*(.*?)\*'),      # *italic*
+    re.compile(r'__(.*?)__'),      # __bold__
+    re.compile(r'_(.*?)_'),        # _italic_
+)
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+MULTI_SPACE_RE = re.compile(r' +')
+
+TONE_INSTRUCTIONS = {
+    "excited": "Write in an excited, energetic tone. Use exclamation points and enthusiastic language!",
+    "critical": "Write in a critical, analytical tone. Point out both strengths and potential weaknesses.",
+    "questioning": "Write in a questioning, curious tone. Ask rhetorical questions to engage viewers.",
+    "balanced": "Write in a balanced, informative tone. Present facts objectively.",
+    "dramatic": "Write in a dramatic, cinematic tone. Build suspense and excitement."
+}
 
 class PRGAVIModernGUI:
     def __init__(self, root):
@@ -31,6 +100,7 @@ class PRGAVIModernGUI:
         # Variables
         self.is_running = False
         self.process = None
+        self.output_queue = queue.Queue()
         
         # Create the interface
         self.create_interface()
@@ -38,6 +108,9 @@ class PRGAVIModernGUI:
         # Configure styles
         self.setup_styles()
         
+        # Poll process output from the Tk thread
+        self.root.after(100, self.drain_output_queue)
+        
     def create_interface(self):
         # Title section
         title_frame = tk.Frame(self.root, bg='#1e1e1e')
@@ -481,21 +554,21 @@ class PRGAVIModernGUI:
     
     def create_video_thread(self, steam_url, game_name, script, mode, video_start_time, no_input):
         """Thread function for video creation"""
+        temp_script_file = None
         try:
-            self.log_message("🎮 PRGAVI - Unified Shorts Creator")
-            self.log_message("=" * 50)
-            self.log_message(f"Game: {game_name}")
-            self.log_message(f"Mode: {mode}")
+            self.queue_log("🎮 PRGAVI - Unified Shorts Creator")
+            self.queue_log("=" * 50)
+            self.queue_log(f"Game: {game_name}")
+            self.queue_log(f"Mode: {mode}")
             if steam_url:
-                self.log_message(f"Steam URL: {steam_url}")
+                self.queue_log(f"Steam URL: {steam_url}")
             if script:
-                self.log_message(f"Script: {script[:50]}...")
-            self.log_message("")
+                self.queue_log(f"Script: {script[:50]}...")
+            self.queue_log("")
             
             # Create command
             cmd = [
-                sys.executable,
-                "prgavi_unified.py",
+                *CREATOR_COMMAND,
                 "--game", game_name,
                 "--mode", mode,
                 "--video-start-time", str(video_start_time)
@@ -505,69 +578,78 @@ class PRGAVIModernGUI:
                 cmd.extend(["--steam-url", steam_url])
             
             if script:
-                # Create temporary script file
-                temp_script_file = "temp_gui_script.txt"
-                with open(temp_script_file, 'w', encoding='utf-8') as f:
+                # Unique temporary script file (safe with several GUI instances)
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt',
+                                                 prefix='prgavi_script_', delete=False) as f:
                     f.write(script)
+                    temp_script_file = f.name
+                atexit.register(self.remove_temp_file, temp_script_file)
                 cmd.extend(["--script-file", temp_script_file])
             
             if no_input:
                 cmd.append("--no-input")
             
-            self.log_message(f"💻 Command: {' '.join(cmd)}")
-            self.log_message("")
+            self.queue_log(f"💻 Command: {' '.join(cmd)}")
+            self.queue_log("")
             
-            # Execute command
+            # Execute command; this reader thread drains stdout straight into the
+            # log queue, so the child never blocks on a full pipe
             self.process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 universal_newlines=True,
                 bufsize=1,
-                cwd=os.getcwd()
+                cwd=PROJECT_DIR
             )
             
-            # Read output in real-time
-            for line in iter(self.process.stdout.readline, ''):
+            # Hand output to the Tk thread in batches (see drain_output_queue)
+            for line in self.process.stdout:
                 if not self.is_running:  # Check if stopped
                     break
                 
                 line = line.strip()
                 if line:
-                    self.log_message(line)
-                    self.update_status_from_log(line)
+                    self.queue_log(line)
             
             # Wait for completion
             return_code = self.process.wait()
             
-            # Clean up temporary script file
-            if script and os.path.exists("temp_gui_script.txt"):
-                try:
-                    os.remove("temp_gui_script.txt")
-                except:
-                    pass
-            
             # Handle completion
             if return_code == 0 and self.is_running:
-                self.log_message("")
-                self.log_message("🎉 SUCCESS! Video creation completed!")
-                self.log_message("📁 Check the 'output' folder for your video")
-                self.update_status("Completed successfully!", "#00b894")
-                messagebox.showinfo("Success", "Video created successfully!\nCheck the 'output' folder for your video.")
+                self.queue_log("")
+                self.queue_log("🎉 SUCCESS! Video creation completed!")
+                self.queue_log("📁 Check the 'output' folder for your video")
+                self.root.after(0, lambda: self.update_status("Completed successfully!", "#00b894"))
+                self.root.after(0, lambda: messagebox.showinfo("Success", "Video created successfully!\nCheck the 'output' folder for your video."))
             elif return_code != 0 and self.is_running:
-                self.log_message("")
-                self.log_message(f"❌ Process failed with return code: {return_code}")
-                self.update_status("Failed - check logs", "#d63031")
-                messagebox.showerror("Error", "Video creation failed. Check the logs for details.")
+                self.queue_log("")
+                self.queue_log(f"❌ Process failed with return code: {return_code}")
+                self.root.after(0, lambda: self.update_status("Failed - check logs", "#d63031"))
+                self.root.after(0, lambda: messagebox.showerror("Error", "Video creation failed. Check the logs for details."))
         
         except Exception as e:
-            self.log_message(f"❌ ERROR: {str(e)}")
-            self.update_status("Error occurred", "#d63031")
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            error = str(e)
+            self.queue_log(f"❌ ERROR: {error}")
+            self.root.after(0, lambda: self.update_status("Error occurred", "#d63031"))
+            self.root.after(0, lambda: messagebox.showerror("Error", f"An error occurred: {error}"))
         finally:
+            # Clean up temporary script file (the creator normally removes it)
+            if temp_script_file:
+                self.remove_temp_file(temp_script_file)
+            
             # Reset UI
             self.root.after(0, self.reset_ui)
     
+    @staticmethod
+    def remove_temp_file(path):
+        """Remove a temporary file if it still exists"""
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+    
     def update_status_from_log(self, line):
         """Update status based on log content"""
         if "📥" in line or "Downloading" in line:
@@ -595,36 +677,43 @@ class PRGAVIModernGUI:
     
     def show_catalog(self):
         """Show catalog in separate window"""
+        mode = self.mode_var.get()
+        thread = threading.Thread(target=self.load_catalog_thread, args=(mode,), daemon=True)
+        thread.start()
+    
+    def load_catalog_thread(self, mode):
+        """Run the catalog command without blocking the Tk event loop"""
         try:
-            mode = self.mode_var.get()
-            cmd = [sys.executable, "prgavi_unified.py", "--catalog", "--mode", mode]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Create catalog window
-            catalog_window = tk.Toplevel(self.root)
-            catalog_window.title(f"Game Catalog - {mode.upper()}")
-            catalog_window.geometry("600x500")
-            catalog_window.configure(bg='#1e1e1e')
-            
-            # Catalog text area
-            catalog_text = scrolledtext.ScrolledText(
-                catalog_window,
-                wrap=tk.WORD,
-                font=("Consolas", 10),
-                bg='#1a1a1a',
-                fg='#ffffff',
-                relief='flat',
-                bd=10
-            )
-            catalog_text.pack(fill='both', expand=True, padx=10, pady=10)
-            
-            # Insert catalog content
-            catalog_text.insert(tk.END, result.stdout)
-            catalog_text.config(state='disabled')
-            
+            cmd = [*CREATOR_COMMAND, "--catalog", "--mode", mode]
+            result = subprocess.run(cmd, capture_output=True, text=True, cwd=PROJECT_DIR)
+            self.root.after(0, lambda: self.open_catalog_window(mode, result.stdout))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load catalog: {e}")
+            error = str(e)
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to load catalog: {error}"))
+    
+    def open_catalog_window(self, mode, catalog_output):
+        """Display catalog output in a new window"""
+        # Create catalog window
+        catalog_window = tk.Toplevel(self.root)
+        catalog_window.title(f"Game Catalog - {mode.upper()}")
+        catalog_window.geometry("600x500")
+        catalog_window.configure(bg='#1e1e1e')
+        
+        # Catalog text area
+        catalog_text = scrolledtext.ScrolledText(
+            catalog_window,
+            wrap=tk.WORD,
+            font=("Consolas", 10),
+            bg='#1a1a1a',
+            fg='#ffffff',
+            relief='flat',
+            bd=10
+        )
+        catalog_text.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        # Insert catalog content
+        catalog_text.insert(tk.END, catalog_output)
+        catalog_text.config(state='disabled')
     
     def clear_all(self):
         """Clear all input fields and logs"""
@@ -638,10 +727,41 @@ class PRGAVIModernGUI:
         """Add message to log area"""
         self.log_area.config(state='normal')
         self.log_area.insert(tk.END, f"{message}\n")
+        self.trim_log()
         self.log_area.see(tk.END)
         self.log_area.config(state='disabled')
         self.root.update_idletasks()
     
+    def queue_log(self, message):
+        """Queue a log message from a worker thread"""
+        self.output_queue.put(message)
+    
+    def drain_output_queue(self):
+        """Append queued log messages in one batch, then reschedule"""
+        lines = []
+        try:
+            while len(lines) < 500:
+                lines.append(self.output_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if lines:
+            self.log_area.config(state='normal')
+            self.log_area.insert(tk.END, "\n".join(lines) + "\n")
+            self.trim_log()
+            self.log_area.see(tk.END)
+            self.log_area.config(state='disabled')
+            for line in lines:
+                self.update_status_from_log(line)
+        
+        self.root.after(100, self.drain_output_queue)
+    
+    def trim_log(self):
+        """Keep the log area bounded to MAX_LOG_LINES (call while state is normal)"""
+        line_count = int(self.log_area.index('end-1c').split('.')[0])
+        if line_count > MAX_LOG_LINES:
+            self.log_area.delete('1.0', f'{line_count - MAX_LOG_LINES + 1}.0')
+    
     def clear_log(self):
         """Clear log area"""
         self.log_area.config(state='normal')
@@ -949,39 +1069,23 @@ class ScriptGeneratorWindow:
             
             game_info = self.fetch_steam_info()
             
-            # Create tone-specific instructions
-            tone_instructions = {
-                "excited": "Write in an excited, energetic tone. Use exclamation points and enthusiastic language!",
-                "critical": "Write in a critical, analytical tone. Point out both strengths and potential weaknesses.",
-                "questioning": "Write in a questioning, curious tone. Ask rhetorical questions to engage viewers.",
-                "balanced": "Write in a balanced, informative tone. Present facts objectively.",
-                "dramatic": "Write in a dramatic, cinematic tone. Build suspense and excitement."
-            }
-            
-            # Build the prompt
+            # Build the prompt: stable instructions first, game-specific info last
             prompt = f"""
 {system_prompt}
 
+Tone Instructions: {TONE_INSTRUCTIONS.get(tone, TONE_INSTRUCTIONS["balanced"])}
+
 Game Information:
 {game_info}
 
-Tone Instructions: {tone_instructions.get(tone, tone_instructions["balanced"])}
-
-CRITICAL REQUIREMENTS:
-- Write ONLY the script - no explanations, comments, or extra text
-- Maximum 30 seconds when read aloud (approximately 75-80 words)
-- Start with an immediate hook in first 3 seconds
-- End with a call to action
-- Make it punchy and engaging for YouTube Shorts
-
 Script:
 """
             
             self.window.after(0, lambda: self.generated_script_text.delete(1.0, tk.END))
             self.window.after(0, lambda: self.generated_script_text.insert(1.0, "Generating script with AI..."))
             
-            # Make API request
-            response = self.make_openrouter_request(prompt)
+            # Make API request, showing the script as it streams in
+            response = self.make_openrouter_request(prompt, on_progress=self.show_partial_script)
             
             # Update UI with result
             self.window.after(0, lambda: self.update_generated_script(response))
@@ -1000,8 +1104,8 @@ Script:
         except Exception as e:
             return f"Game URL: {self.steam_url}\nNote: Could not fetch additional game information ({str(e)})"
     
-    def make_openrouter_request(self, prompt):
-        """Make request to OpenRouter API"""
+    def make_openrouter_request(self, prompt, on_progress=None):
+        """Make streaming request to OpenRouter API"""
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -1010,26 +1114,59 @@ Script:
         data = {
             "model": "meta-llama/llama-3.1-8b-instruct:free",
             "messages": [
-                {"role": "system", "content": "You are a professional YouTube Shorts script writer. Return ONLY the script text with no additional commentary, explanations, or formatting. Keep scripts under 80 words for 30-second videos."},
+                {"role": "system", "content": SCRIPT_WRITER_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            "max_tokens": 150,
-            "temperature": 0.7
+            "max_tokens": SCRIPT_MAX_TOKENS,
+            "temperature": 0.7,
+            "stream": True
         }
         
-        response = requests.post(
+        response = OPENROUTER_SESSION.post(
             "https://openrouter.ai/api/v1/chat/completions",
             headers=headers,
             json=data,
-            timeout=30
+            timeout=30,
+            stream=True
         )
         
-        if response.status_code == 200:
-            result = response.json()
-            script = result["choices"][0]["message"]["content"]
-            return self.post_process_script(script)
-        else:
+        if response.status_code != 200:
             raise Exception(f"API request failed: {response.status_code} - {response.text}")
+        
+        # Accumulate server-sent event deltas so the script shows up as it is written
+        chunks = []
+        # text/event-stream has no charset, so requests would fall back to ISO-8859-1
+        # and mangle curly quotes and dashes
+        response.encoding = "utf-8"
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data: "):
+                    continue
+                payload = line[len("data: "):]
+                if payload == "[DONE]":
+                    break
+                
+                choices = json.loads(payload).get("choices") or [{}]
+                delta = choices[0].get("delta", {}).get("content")
+                if not delta:
+                    continue
+                
+                chunks.append(delta)
+                text = "".join(chunks)
+                if on_progress:
+                    on_progress(text)
+                
+                # Stop reading once the script is clearly longer than a Short can use
+                # (counted the same way the script is measured for TTS)
+                if count_words(text) > MAX_SCRIPT_WORDS:
+                    break
+        finally:
+            response.close()
+        
+        script = "".join(chunks)
+        if not script.strip():
+            raise Exception("API returned an empty script")
+        return self.post_process_script(script)
     
     def post_process_script(self, script):
         """Clean up the generated script"""
@@ -1072,18 +1209,23 @@ Script:
         script = script.strip('"\'*')
         
         # Remove markdown formatting
-        script = re.sub(r'\*\*(.*?)\*\*', r'\1', script)  # Remove **bold**
-        script = re.sub(r'\*(.*?)\*', r'\1', script)      # Remove *italic*
-        script = re.sub(r'__(.*?)__', r'\1', script)      # Remove __bold__
-        script = re.sub(r'_(.*?)_', r'\1', script)        # Remove _italic_
+        for pattern in MARKDOWN_PATTERNS:
+            script = pattern.sub(r'\1', script)
         
         # Clean up extra whitespace
-        script = re.sub(r'\n\s*\n', '\n\n', script)       # Multiple newlines to double
-        script = re.sub(r' +', ' ', script)               # Multiple spaces to single
+        script = BLANK_LINES_RE.sub('\n\n', script)       # Multiple newlines to double
+        script = MULTI_SPACE_RE.sub(' ', script)          # Multiple spaces to single
         script = script.strip()
         
         return script
     
+    def show_partial_script(self, partial_script):
+        """Schedule a progressive update of the script area from the worker thread"""
+        def update():
+            self.generated_script_text.delete(1.0, tk.END)
+            self.generated_script_text.insert(1.0, partial_script)
+        self.window.after(0, update)
+    
     def update_generated_script(self, script):
         """Update the generated script text area"""
         self.generated_script_text.delete(1.0, tk.END)
@@ -1113,7 +1255,7 @@ Script:
 def main():
     """Main function to run the GUI"""
     # Check if unified script exists
-    if not os.path.exists("prgavi_unified.py"):
+    if not UNIFIED_SCRIPT.is_file():
         messagebox.showerror(
             "Error",
             "prgavi_unified.py not found!\n"